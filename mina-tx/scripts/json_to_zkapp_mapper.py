@@ -6,30 +6,53 @@ Converts a JavaScript object representation of a ZkApp command into Rust code fo
 This script generates the Rust struct initialization code that can be used in test_vectors.rs.
 """
 
+import json
 import re
 import sys
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+
+# Single-pass JS -> JSON lexer. String literals are matched first and passed
+# through untouched, so keys, comments and BigInt suffixes are only rewritten
+# outside of strings (e.g. "https://..." or base58 values ending in "9n").
+_JS_TOKEN_RE = re.compile(
+    r"""
+    (?P<string>"(?:[^"\\\n]|\\.)*")                # string literal
+    | (?P<comment>//[^\n]*)                          # line comment
+    | (?P<bigint>\b\d+)n\b                           # BigInt literal, e.g. 100n
+    | (?P<undefined>\bundefined\b)                   # undefined -> null
+    | (?P<key>\b\w+)(?=\s*:)                         # unquoted object key
+    | (?P<trailing>,)(?=(?:\s|//[^\n]*)*[}\]])        # trailing comma
+    """,
+    re.VERBOSE,
+)
+
+
+def _js_token_to_json(match: "re.Match[str]") -> str:
+    """Rewrite a single token matched by _JS_TOKEN_RE into its JSON form."""
+    kind = match.lastgroup
+    if kind == "string":
+        return match.group()
+    if kind == "bigint":
+        return match.group("bigint")
+    if kind == "undefined":
+        return "null"
+    if kind == "key":
+        return f'"{match.group("key")}"'
+    # Comments and trailing commas are dropped
+    return ""
 
 
 def parse_js_object(content: str) -> Dict[str, Any]:
     """Parse a JavaScript object literal with BigInt support."""
-    # Remove comments and normalize whitespace
-    content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
-
-    # Replace BigInt literals (numbers followed by 'n') with regular numbers
-    content = re.sub(r'(\d+)n\b', r'\1', content)
-
-    # Replace undefined with null
-    content = re.sub(r'\bundefined\b', 'null', content)
-
-    # Replace JavaScript object key syntax (unquoted keys) with JSON syntax
-    content = re.sub(r'(\w+):', r'"\1":', content)
-
-    # Handle trailing commas
-    content = re.sub(r',(\s*[}\]])', r'\1', content)
+    # Strip comments, BigInt suffixes, undefined, unquoted keys and trailing
+    # commas in one scan over the source
+    content = _JS_TOKEN_RE.sub(_js_token_to_json, content)
 
     # Now we can parse it as JSON
-    import json
     try:
         return json.loads(content)
     except json.JSONDecodeError as e:
@@ -41,32 +64,42 @@ def parse_js_object(content: str) -> Dict[str, Any]:
         raise
 
 
+_RUST_STRING_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r'})
+
+
 def escape_string(s: str) -> str:
     """Escape special characters in strings for Rust string literals."""
-    return s.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r')
+    return s.translate(_RUST_STRING_ESCAPES)
 
 
 def _is_int_like(v: Any) -> bool:
-    return isinstance(v, int) or (isinstance(v, str) and v.isdigit())
+    # isascii() rejects non-ASCII digits such as "²" that isdigit() accepts
+    return isinstance(v, int) or (isinstance(v, str) and v.isascii() and v.isdigit())
 
 
 def _int_token(v: Any) -> str:
-    if isinstance(v, int):
+    # o1js JSON encodes most integers as decimal strings, so check str first
+    if isinstance(v, str):
+        if v.isascii() and v.isdigit():
+            return v
+    elif isinstance(v, int):
         return str(v)
-    if isinstance(v, str) and v.isdigit():
-        return v
     raise ValueError(f"Expected integer-like value, got: {v!r}")
 
 
+@lru_cache(maxsize=4096, typed=True)
+def _format_field_literal(value: Union[str, int]) -> str:
+    # Test vectors repeat a handful of values ("0", hashes, state) many times
+    return f'Field(Fp::from_str("{value}").unwrap())'
+
+
 def format_field(value: Union[str, int, None]) -> str:
     """Format a field value for Rust Field type."""
     if value is None:
         return "Field::default()"
-    if isinstance(value, int):
-        return f'Field(Fp::from_str("{value}").unwrap())'
-    if isinstance(value, str):
+    if isinstance(value, (int, str)):
         # assume numeric string for Field
-        return f'Field(Fp::from_str("{value}").unwrap())'
+        return _format_field_literal(value)
     raise ValueError(f"Unsupported field value: {value!r}")
 
 
@@ -82,12 +115,18 @@ def format_field_token(value: Union[str, int, None]) -> str:
     return f"TokenId({inner})"
 
 
+@lru_cache(maxsize=256)
+def _format_public_key_address(address: str) -> str:
+    # Fee payer and account updates usually share a handful of addresses
+    return f'PublicKey(CompressedPubKey::from_address("{escape_string(address)}").unwrap())'
+
+
 def format_public_key(key_data: Union[str, Dict[str, Any], None]) -> str:
     """Format a public key for Rust PublicKey type."""
     if key_data is None:
         return "PublicKey::default()"
     if isinstance(key_data, str):
-        return f'PublicKey(CompressedPubKey::from_address("{escape_string(key_data)}").unwrap())'
+        return _format_public_key_address(key_data)
     # Only address format supported by the Rust type in this codebase
     return "PublicKey::default()"
 
@@ -109,10 +148,20 @@ def format_option_public_key(value: Any) -> str:
     return format_option(format_public_key(value))
 
 
+def format_bool(value: Any) -> str:
+    """Format a boolean as a Rust bool literal."""
+    # Identity checks cover JSON booleans without building a str to lower()
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return str(value).lower()
+
+
 def format_option_bool(value: Any) -> str:
     if value is None:
         return "None"
-    return f"Some({str(value).lower()})"
+    return format_option(format_bool(value))
 
 
 def format_range_condition_opt(range_data: Optional[Dict[str, Any]], type_name: str) -> str:
@@ -133,90 +182,131 @@ def format_range_condition_opt(range_data: Optional[Dict[str, Any]], type_name:
     return f"Some(RangeCondition {{ lower: {lower_expr}, upper: {upper_expr} }})"
 
 
+_AUTH_REQUIRED = {
+    "Signature": "AuthRequired::Signature",
+    "Impossible": "AuthRequired::Impossible",
+    "Either": "AuthRequired::Either",
+    "Proof": "AuthRequired::Proof",
+    "None": "AuthRequired::None",
+    "Both": "AuthRequired::Both",
+}
+
+
 def format_auth_required(auth_str: Optional[str]) -> str:
     """Map string to AuthRequired enum."""
-    if not auth_str:
-        return "AuthRequired::None"
-    mapping = {
-        "Signature": "AuthRequired::Signature",
-        "Impossible": "AuthRequired::Impossible",
-        "Either": "AuthRequired::Either",
-        "Proof": "AuthRequired::Proof",
-        "None": "AuthRequired::None",
-        "Both": "AuthRequired::Both",
-    }
-    return mapping.get(auth_str, "AuthRequired::None")
+    # Missing, empty and unknown values all fall back to AuthRequired::None
+    return _AUTH_REQUIRED.get(auth_str, "AuthRequired::None")
+
+
+# Zkapp state has eight slots, and most account updates leave all of them unset
+_ZKAPP_STATE_LENGTH = 8
+_ALL_NONE_STATE = "[" + ", ".join(["None"] * _ZKAPP_STATE_LENGTH) + "]"
+
+
+def _format_state_slots(values: List[Any]) -> str:
+    """Format a list of optional fields as a slice literal."""
+    if len(values) == _ZKAPP_STATE_LENGTH and all(item is None for item in values):
+        return _ALL_NONE_STATE
+    joined_inline = ", ".join("None" if item is None else format_option(format_field(item)) for item in values)
+    return f"[{joined_inline}]"
 
 
 def format_app_state(app_state: List[Any]) -> str:
     """Format app_state as a slice [Option<Field>; 8]."""
-    items: List[str] = []
-    for item in app_state:
-        if item is None:
-            items.append("None")
-        else:
-            items.append(f"Some({format_field(item)})")
-    joined_inline = ", ".join(items)
     # match zkapp_proper.rs style: slice literal
-    return f"[{joined_inline}]"
+    return _format_state_slots(app_state)
+
+
+# Fixed indentation of the Events / Actions data vectors inside an account update
+_DATA_ROW_INDENT = "\n" + " " * 36
+_DATA_ROW_SEPARATOR = "," + _DATA_ROW_INDENT
+_DATA_CLOSE = ",\n" + " " * 32 + "]"
+
+_EVENTS_TEMPLATE = """Events {{
+                                data: {data}
+                            }}"""
+_ACTIONS_TEMPLATE = """Actions {{
+                                data: {data}
+                            }}"""
+_EMPTY_EVENTS = _EVENTS_TEMPLATE.format(data="vec![]")
+_EMPTY_ACTIONS = _ACTIONS_TEMPLATE.format(data="vec![]")
+
+
+def _format_data_rows(rows: List[List[Union[str, int]]]) -> str:
+    """Format a non-empty list of field rows as a nested vec! literal."""
+    joined_rows = _DATA_ROW_SEPARATOR.join(f"vec![{', '.join(map(format_field, row))}]" for row in rows)
+    return f"vec![{_DATA_ROW_INDENT}{joined_rows}{_DATA_CLOSE}"
 
 
 def format_events(events: List[List[Union[str, int]]]) -> str:
     """Format events for Rust Events struct without hash field."""
     if not events:
-        data_formatted = "vec![]"
-    else:
-        formatted_events: List[str] = []
-        for event in events:
-            formatted_fields = [format_field(field) for field in event]
-            formatted_events.append(f"vec![{', '.join(formatted_fields)}]")
-        joined_events = ',\n                                    '.join(formatted_events)
-        data_formatted = f"vec![\n                                    {joined_events},\n                                ]"
-    return f"""Events {{
-                                data: {data_formatted}
-                            }}"""
+        return _EMPTY_EVENTS
+    return _EVENTS_TEMPLATE.format(data=_format_data_rows(events))
 
 
 def format_actions(actions: List[List[Union[str, int]]]) -> str:
     """Format actions array for Rust Actions struct without hash field."""
     if not actions:
-        data_formatted = "vec![]"
-    else:
-        formatted_actions: List[str] = []
-        for action in actions:
-            formatted_fields = [format_field(field) for field in action]
-            formatted_actions.append(f"vec![{', '.join(formatted_fields)}]")
-        joined_actions = ',\n                                    '.join(formatted_actions)
-        data_formatted = f"vec![\n                                    {joined_actions},\n                                ]"
-    return f"""Actions {{
-                                data: {data_formatted}
-                            }}"""
+        return _EMPTY_ACTIONS
+    return _ACTIONS_TEMPLATE.format(data=_format_data_rows(actions))
 
 
 def format_account_state(state: List[Any]) -> str:
     """Format account state as a slice [Option<Field>; 8]."""
-    items: List[str] = []
-    for item in state:
-        if item is None:
-            items.append("None")
-        else:
-            items.append(f"Some({format_field(item)})")
-    joined_inline = ", ".join(items)
-    return f"[{joined_inline}]"
+    return _format_state_slots(state)
+
+
+_VERIFICATION_KEY_TEMPLATE = """Some(VerificationKeyData {{
+                                        data: "{data}".to_string(),
+                                        hash: {hash},
+                                    }})"""
 
 
 def format_verification_key(vk_data: Optional[Dict[str, Any]]) -> str:
     """Format Option<VerificationKeyData>."""
     if not vk_data:
         return "None"
-    data = vk_data.get("data", "")
-    hash_val = vk_data.get("hash", "0")
-    return f"""Some(VerificationKeyData {{
-                                        data: "{escape_string(data)}".to_string(),
-                                        hash: {format_field(hash_val)},
+    return _VERIFICATION_KEY_TEMPLATE.format(
+        data=escape_string(vk_data.get("data", "")),
+        hash=format_field(vk_data.get("hash", "0")),
+    )
+
+
+# (o1js key, Rust field) pairs of the plain AuthRequired permissions, split
+# around the nested set_verification_key entry to keep the Rust field order
+_PERMISSION_FIELDS_BEFORE_VK = (
+    ("editState", "edit_state"),
+    ("access", "access"),
+    ("send", "send"),
+    ("receive", "receive"),
+    ("setDelegate", "set_delegate"),
+    ("setPermissions", "set_permissions"),
+)
+_PERMISSION_FIELDS_AFTER_VK = (
+    ("setZkappUri", "set_zkapp_uri"),
+    ("editActionState", "edit_action_state"),
+    ("setTokenSymbol", "set_token_symbol"),
+    ("incrementNonce", "increment_nonce"),
+    ("setVotingFor", "set_voting_for"),
+    ("setTiming", "set_timing"),
+)
+_PERMISSION_INDENT = "\n" + " " * 40
+
+_PERMISSIONS_TEMPLATE = """Some(Permissions {{{before_vk}
+                                        set_verification_key: SetVerificationKey {{
+                                            auth: {vk_auth},
+                                            txn_version: {vk_txn_version},
+                                        }},{after_vk}
                                     }})"""
 
 
+def _format_permission_fields(permissions: Dict[str, Any], fields: Tuple[Tuple[str, str], ...]) -> str:
+    return "".join(
+        f"{_PERMISSION_INDENT}{rust_key}: {format_auth_required(permissions.get(js_key))}," for js_key, rust_key in fields
+    )
+
+
 def format_permissions(permissions: Optional[Dict[str, Any]]) -> str:
     """Format Option<Permissions>."""
     if not permissions:
@@ -224,25 +314,21 @@ def format_permissions(permissions: Optional[Dict[str, Any]]) -> str:
     set_vk = permissions.get("setVerificationKey", {})
     auth = set_vk.get("auth", "None") if isinstance(set_vk, dict) else "None"
     txn_version = set_vk.get("txnVersion", "0") if isinstance(set_vk, dict) else "0"
-    txn_version_tok = _int_token(txn_version)
-
-    return f"""Some(Permissions {{
-                                        edit_state: {format_auth_required(permissions.get("editState"))},
-                                        access: {format_auth_required(permissions.get("access"))},
-                                        send: {format_auth_required(permissions.get("send"))},
-                                        receive: {format_auth_required(permissions.get("receive"))},
-                                        set_delegate: {format_auth_required(permissions.get("setDelegate"))},
-                                        set_permissions: {format_auth_required(permissions.get("setPermissions"))},
-                                        set_verification_key: SetVerificationKey {{
-                                            auth: {format_auth_required(auth)},
-                                            txn_version: {txn_version_tok},
-                                        }},
-                                        set_zkapp_uri: {format_auth_required(permissions.get("setZkappUri"))},
-                                        edit_action_state: {format_auth_required(permissions.get("editActionState"))},
-                                        set_token_symbol: {format_auth_required(permissions.get("setTokenSymbol"))},
-                                        increment_nonce: {format_auth_required(permissions.get("incrementNonce"))},
-                                        set_voting_for: {format_auth_required(permissions.get("setVotingFor"))},
-                                        set_timing: {format_auth_required(permissions.get("setTiming"))},
+
+    return _PERMISSIONS_TEMPLATE.format(
+        before_vk=_format_permission_fields(permissions, _PERMISSION_FIELDS_BEFORE_VK),
+        vk_auth=format_auth_required(auth),
+        vk_txn_version=_int_token(txn_version),
+        after_vk=_format_permission_fields(permissions, _PERMISSION_FIELDS_AFTER_VK),
+    )
+
+
+_TIMING_TEMPLATE = """Some(TimingData {{
+                                        initial_minimum_balance: {initial_minimum_balance},
+                                        cliff_time: {cliff_time},
+                                        cliff_amount: {cliff_amount},
+                                        vesting_period: {vesting_period},
+                                        vesting_increment: {vesting_increment},
                                     }})"""
 
 
@@ -250,13 +336,13 @@ def format_timing(timing_data: Optional[Dict[str, Any]]) -> str:
     """Format Option<TimingData>."""
     if not timing_data:
         return "None"
-    return f"""Some(TimingData {{
-                                        initial_minimum_balance: {_int_token(timing_data.get("initialMinimumBalance", 0))},
-                                        cliff_time: {_int_token(timing_data.get("cliffTime", 0))},
-                                        cliff_amount: {_int_token(timing_data.get("cliffAmount", 0))},
-                                        vesting_period: {_int_token(timing_data.get("vestingPeriod", 0))},
-                                        vesting_increment: {_int_token(timing_data.get("vestingIncrement", 0))},
-                                    }})"""
+    return _TIMING_TEMPLATE.format(
+        initial_minimum_balance=_int_token(timing_data.get("initialMinimumBalance", 0)),
+        cliff_time=_int_token(timing_data.get("cliffTime", 0)),
+        cliff_amount=_int_token(timing_data.get("cliffAmount", 0)),
+        vesting_period=_int_token(timing_data.get("vestingPeriod", 0)),
+        vesting_increment=_int_token(timing_data.get("vestingIncrement", 0)),
+    )
 
 
 def format_option_token_symbol(value: Any) -> str:
@@ -275,27 +361,30 @@ def format_option_zkapp_uri(value: Any) -> str:
     return f"Some(ZkappUri(vec![{bytes_inline}]))"
 
 
+_EPOCH_DATA_TEMPLATE = """EpochData {{
+                                        ledger: EpochLedger {{
+                                            hash: {ledger_hash},
+                                            total_currency: {ledger_currency},
+                                        }},
+                                        seed: {seed},
+                                        start_checkpoint: {start_checkpoint},
+                                        lock_checkpoint: {lock_checkpoint},
+                                        epoch_length: {epoch_length},
+                                    }}"""
+
+
 def format_epoch_data(epoch_data: Dict[str, Any]) -> str:
     """Format EpochData."""
     ledger = epoch_data.get("ledger", {})
-    ledger_hash = ledger.get("hash")
-    ledger_currency = ledger.get("totalCurrency")
 
-    seed = epoch_data.get("seed")
-    start_checkpoint = epoch_data.get("startCheckpoint")
-    lock_checkpoint = epoch_data.get("lockCheckpoint")
-    epoch_length = epoch_data.get("epochLength")
-
-    return f"""EpochData {{
-                                        ledger: EpochLedger {{
-                                            hash: {format_option_field(ledger_hash)},
-                                            total_currency: {format_range_condition_opt(ledger_currency, "u64")},
-                                        }},
-                                        seed: {format_option_field(seed)},
-                                        start_checkpoint: {format_option_field(start_checkpoint)},
-                                        lock_checkpoint: {format_option_field(lock_checkpoint)},
-                                        epoch_length: {format_range_condition_opt(epoch_length, "u32")},
-                                    }}"""
+    return _EPOCH_DATA_TEMPLATE.format(
+        ledger_hash=format_option_field(ledger.get("hash")),
+        ledger_currency=format_range_condition_opt(ledger.get("totalCurrency"), "u64"),
+        seed=format_option_field(epoch_data.get("seed")),
+        start_checkpoint=format_option_field(epoch_data.get("startCheckpoint")),
+        lock_checkpoint=format_option_field(epoch_data.get("lockCheckpoint")),
+        epoch_length=format_range_condition_opt(epoch_data.get("epochLength"), "u32"),
+    )
 
 
 def format_action_state_opt(value: Any) -> str:
@@ -306,89 +395,63 @@ def format_action_state_opt(value: Any) -> str:
     return f"Some(ActionState({inner}))"
 
 
-def format_account_update(update: Dict[str, Any], index: int) -> str:
-    """Format a single account update for Rust."""
-    body = update["body"]
-
-    # Balance change
-    balance_change = body["balanceChange"]
-    magnitude = _int_token(balance_change["magnitude"])
-    sgn = balance_change["sgn"]
-    sgn_value = "1" if sgn == "Positive" else "-1"
-
-    # may_use_token
-    may_use_token = body["mayUseToken"]
-
-    # authorization kind
-    auth_kind = body["authorizationKind"]
-
-    # preconditions
-    preconditions = body["preconditions"]
-    network = preconditions["network"]
-    account = preconditions["account"]
-
-    # update fields
-    update_data = body["update"]
-
-    # Always wrap token_id in TokenId(...)
-    token_formatter = format_field_token
-
-    return f"""// Account update {index + 1}
+# Rust skeleton for a single account update, filled in by format_account_update
+_ACCOUNT_UPDATE_TEMPLATE = """// Account update {number}
                     AccountUpdate {{
                         body: AccountUpdateBody {{
-                            public_key: {format_public_key(body["publicKey"])},
-                            token_id: {token_formatter(body["tokenId"])},
+                            public_key: {public_key},
+                            token_id: {token_id},
                             update: Update {{
-                                app_state: {format_app_state(update_data["appState"])},
-                                delegate: {format_option_public_key(update_data.get("delegate"))},
-                                verification_key: {format_verification_key(update_data.get("verificationKey"))},
-                                permissions: {format_permissions(update_data.get("permissions"))},
-                                zkapp_uri: {format_option_zkapp_uri(update_data.get("zkappUri"))},
-                                token_symbol: {format_option_token_symbol(update_data.get("tokenSymbol"))},
-                                timing: {format_timing(update_data.get("timing"))},
-                                voting_for: {format_option_field(update_data.get("votingFor"))},
+                                app_state: {app_state},
+                                delegate: {update_delegate},
+                                verification_key: {verification_key},
+                                permissions: {permissions},
+                                zkapp_uri: {zkapp_uri},
+                                token_symbol: {token_symbol},
+                                timing: {timing},
+                                voting_for: {voting_for},
                             }},
                             balance_change: BalanceChange {{
                                 magnitude: {magnitude},
                                 sgn: {sgn_value},
                             }},
-                            increment_nonce: {str(body["incrementNonce"]).lower()},
-                            events: {format_events(body["events"])},
-                            actions: {format_actions(body["actions"])},
-                            call_data: {format_field(body["callData"])},
-                            call_depth: {_int_token(body["callDepth"])},
+                            increment_nonce: {increment_nonce},
+                            events: {events},
+                            actions: {actions},
+                            call_data: {call_data},
+                            call_depth: {call_depth},
                             preconditions: Preconditions {{
                                 network: NetworkPreconditions {{
-                                    snarked_ledger_hash: {format_option_field(network.get("snarkedLedgerHash"))},
-                                    blockchain_length: {format_range_condition_opt(network.get("blockchainLength"), "u32")},
-                                    min_window_density: {format_range_condition_opt(network.get("minWindowDensity"), "u32")},
-                                    total_currency: {format_range_condition_opt(network.get("totalCurrency"), "u64")},
-                                    global_slot_since_genesis: {format_range_condition_opt(network.get("globalSlotSinceGenesis"), "u32")},
-                                    staking_epoch_data: {format_epoch_data(network["stakingEpochData"])},
-                                    next_epoch_data: {format_epoch_data(network["nextEpochData"])},
+                                    snarked_ledger_hash: {snarked_ledger_hash},
+                                    blockchain_length: {blockchain_length},
+                                    min_window_density: {min_window_density},
+                                    total_currency: {total_currency},
+                                    global_slot_since_genesis: {global_slot_since_genesis},
+                                    staking_epoch_data: {staking_epoch_data},
+                                    next_epoch_data: {next_epoch_data},
                                 }},
                                 account: AccountPreconditions {{
-                                    balance: {format_range_condition_opt(account.get("balance"), "u64")},
-                                    nonce: {format_range_condition_opt(account.get("nonce"), "u32")},
-                                    receipt_chain_hash: {format_option_field(account.get("receiptChainHash"))},
-                                    delegate: {format_option_public_key(account.get("delegate"))},
-                                    state: {format_account_state(account["state"])},
-                                    action_state: {format_action_state_opt(account.get("actionState"))},
-                                    proved_state: {format_option_bool(account.get("provedState"))},
-                                    is_new: {format_option_bool(account.get("isNew"))},
+                                    balance: {balance},
+                                    nonce: {nonce},
+                                    receipt_chain_hash: {receipt_chain_hash},
+                                    delegate: {account_delegate},
+                                    state: {state},
+                                    action_state: {action_state},
+                                    proved_state: {proved_state},
+                                    is_new: {is_new},
                                 }},
-                                valid_while: {format_range_condition_opt(preconditions.get("validWhile"), "u32")},
+                                valid_while: {valid_while},
                             }},
-                            use_full_commitment: {str(body["useFullCommitment"]).lower()},
-                            implicit_account_creation_fee: {str(body["implicitAccountCreationFee"]).lower()},
+                            use_full_commitment: {use_full_commitment},
+                            implicit_account_creation_fee: {implicit_account_creation_fee},
                             may_use_token: MayUseToken {{
-                                parents_own_token: {str(may_use_token["parentsOwnToken"]).lower()},
-                                inherit_from_parent: {str(may_use_token["inheritFromParent"]).lower()},
+                                parents_own_token: {parents_own_token},
+                                inherit_from_parent: {inherit_from_parent},
                             }},
                             authorization_kind: AuthorizationKind {{
-                                is_signed: {str(auth_kind["isSigned"]).lower()},
-                                is_proved: {str(auth_kind["isProved"]).lower()},
-                                verification_key_hash: {format_field(auth_kind["verificationKeyHash"])},
+                                is_signed: {is_signed},
+                                is_proved: {is_proved},
+                                verification_key_hash: {verification_key_hash},
                             }},
                         }},
                         authorization: Authorization {{
@@ -398,6 +461,117 @@ def format_account_update(update: Dict[str, Any], index: int) -> str:
                     }}"""
 
 
+def format_account_update(update: Dict[str, Any], index: int) -> str:
+    """Format a single account update for Rust."""
+    body = update["body"]
+
+    # Balance change
+    balance_change = body["balanceChange"]
+    magnitude = _int_token(balance_change["magnitude"])
+    sgn_value = "1" if balance_change["sgn"] == "Positive" else "-1"
+
+    # may_use_token
+    may_use_token = body["mayUseToken"]
+    parents_own_token = format_bool(may_use_token["parentsOwnToken"])
+    inherit_from_parent = format_bool(may_use_token["inheritFromParent"])
+
+    # authorization kind
+    auth_kind = body["authorizationKind"]
+    is_signed = format_bool(auth_kind["isSigned"])
+    is_proved = format_bool(auth_kind["isProved"])
+    verification_key_hash = format_field(auth_kind["verificationKeyHash"])
+
+    # top-level body fields
+    public_key = format_public_key(body["publicKey"])
+    # Always wrap token_id in TokenId(...)
+    token_id = format_field_token(body["tokenId"])
+    increment_nonce = format_bool(body["incrementNonce"])
+    events = format_events(body["events"])
+    actions = format_actions(body["actions"])
+    call_data = format_field(body["callData"])
+    call_depth = _int_token(body["callDepth"])
+    use_full_commitment = format_bool(body["useFullCommitment"])
+    implicit_account_creation_fee = format_bool(body["implicitAccountCreationFee"])
+
+    # update fields
+    update_data = body["update"]
+    app_state = format_app_state(update_data["appState"])
+    update_delegate = format_option_public_key(update_data.get("delegate"))
+    verification_key = format_verification_key(update_data.get("verificationKey"))
+    permissions = format_permissions(update_data.get("permissions"))
+    zkapp_uri = format_option_zkapp_uri(update_data.get("zkappUri"))
+    token_symbol = format_option_token_symbol(update_data.get("tokenSymbol"))
+    timing = format_timing(update_data.get("timing"))
+    voting_for = format_option_field(update_data.get("votingFor"))
+
+    # preconditions
+    preconditions = body["preconditions"]
+    valid_while = format_range_condition_opt(preconditions.get("validWhile"), "u32")
+
+    network = preconditions["network"]
+    snarked_ledger_hash = format_option_field(network.get("snarkedLedgerHash"))
+    blockchain_length = format_range_condition_opt(network.get("blockchainLength"), "u32")
+    min_window_density = format_range_condition_opt(network.get("minWindowDensity"), "u32")
+    total_currency = format_range_condition_opt(network.get("totalCurrency"), "u64")
+    global_slot_since_genesis = format_range_condition_opt(network.get("globalSlotSinceGenesis"), "u32")
+    staking_epoch_data = format_epoch_data(network["stakingEpochData"])
+    next_epoch_data = format_epoch_data(network["nextEpochData"])
+
+    account = preconditions["account"]
+    balance = format_range_condition_opt(account.get("balance"), "u64")
+    nonce = format_range_condition_opt(account.get("nonce"), "u32")
+    receipt_chain_hash = format_option_field(account.get("receiptChainHash"))
+    account_delegate = format_option_public_key(account.get("delegate"))
+    state = format_account_state(account["state"])
+    action_state = format_action_state_opt(account.get("actionState"))
+    proved_state = format_option_bool(account.get("provedState"))
+    is_new = format_option_bool(account.get("isNew"))
+
+    return _ACCOUNT_UPDATE_TEMPLATE.format(
+        number=index + 1,
+        public_key=public_key,
+        token_id=token_id,
+        app_state=app_state,
+        update_delegate=update_delegate,
+        verification_key=verification_key,
+        permissions=permissions,
+        zkapp_uri=zkapp_uri,
+        token_symbol=token_symbol,
+        timing=timing,
+        voting_for=voting_for,
+        magnitude=magnitude,
+        sgn_value=sgn_value,
+        increment_nonce=increment_nonce,
+        events=events,
+        actions=actions,
+        call_data=call_data,
+        call_depth=call_depth,
+        snarked_ledger_hash=snarked_ledger_hash,
+        blockchain_length=blockchain_length,
+        min_window_density=min_window_density,
+        total_currency=total_currency,
+        global_slot_since_genesis=global_slot_since_genesis,
+        staking_epoch_data=staking_epoch_data,
+        next_epoch_data=next_epoch_data,
+        balance=balance,
+        nonce=nonce,
+        receipt_chain_hash=receipt_chain_hash,
+        account_delegate=account_delegate,
+        state=state,
+        action_state=action_state,
+        proved_state=proved_state,
+        is_new=is_new,
+        valid_while=valid_while,
+        use_full_commitment=use_full_commitment,
+        implicit_account_creation_fee=implicit_account_creation_fee,
+        parents_own_token=parents_own_token,
+        inherit_from_parent=inherit_from_parent,
+        is_signed=is_signed,
+        is_proved=is_proved,
+        verification_key_hash=verification_key_hash,
+    )
+
+
 def format_network_id(network_raw: Any) -> str:
     """Map o1js network identifier to Rust NetworkId enum."""
     if isinstance(network_raw, dict):
@@ -418,22 +592,38 @@ def expected_hash(js_data: Dict[str, Any], camel_key: str, snake_key: str) -> st
     return str(value)
 
 
-def generate_zkapp_command(js_data: Dict[str, Any], test_name: str = "complex_zkapp_command") -> str:
-    """Generate the complete ZKAppCommand Rust code from JavaScript object data."""
+# ZkAppTestVector skeleton; account updates are emitted between header and trailer
+_ZKAPP_COMMAND_HEADER_TEMPLATE = """ZkAppTestVector {{
+            name: "{name}",
+            zkapp_command: ZKAppCommand {{
+                fee_payer: FeePayer {{
+                    body: FeePayerBody {{
+                        public_key: {public_key},
+                        fee: {fee},
+                        valid_until: {valid_until},
+                        nonce: {nonce},
+                    }},
+                    authorization: "{authorization}".to_string(),
+                }},
+                account_updates: """
+_ZKAPP_COMMAND_TRAILER_TEMPLATE = """,
+                memo: {memo},
+            }},
+            network: {network},
+            expected_memo_hash: "{expected_memo_hash}",
+            expected_fee_payer_hash: "{expected_fee_payer_hash}",
+            expected_account_updates_commitment: "{expected_account_updates_commitment}",
+            expected_full_commitment: "{expected_full_commitment}",
+        }}"""
+
+
+def iter_zkapp_command(js_data: Dict[str, Any], test_name: str = "complex_zkapp_command") -> Iterator[str]:
+    """Yield the ZKAppCommand Rust code fragment by fragment, one chunk per account update."""
     fee_payer = js_data["feePayer"]
     account_updates = js_data["accountUpdates"]
     memo = js_data["memo"]
     vector_name = str(js_data.get("name", test_name))
 
-    formatted_updates: List[str] = []
-    for i, update in enumerate(account_updates):
-        formatted_updates.append(format_account_update(update, i))
-
-    if formatted_updates:
-        updates_expr = "vec![\n" + ",".join(formatted_updates) + ",\n                ]"
-    else:
-        updates_expr = "vec![]"
-
     valid_until_val = fee_payer["body"].get("validUntil", None)
     valid_until = f"Some({_int_token(valid_until_val)})" if valid_until_val is not None else "None"
 
@@ -448,47 +638,89 @@ def generate_zkapp_command(js_data: Dict[str, Any], test_name: str = "complex_zk
     )
     expected_full_commitment = expected_hash(js_data, "expectedFullCommitment", "expected_full_commitment")
 
-    return f"""ZkAppTestVector {{
-            name: "{escape_string(vector_name)}",
-            zkapp_command: ZKAppCommand {{
-                fee_payer: FeePayer {{
-                    body: FeePayerBody {{
-                        public_key: {format_public_key(fee_payer["body"]["publicKey"])},
-                        fee: {_int_token(fee_payer["body"]["fee"])},
-                        valid_until: {valid_until},
-                        nonce: {_int_token(fee_payer["body"]["nonce"])},
-                    }},
-                    authorization: "{escape_string(fee_payer["authorization"])}".to_string(),
-                }},
-                account_updates: {updates_expr},
-                memo: {memo_expr},
-            }},
-            network: {network},
-            expected_memo_hash: "{expected_memo_hash}",
-            expected_fee_payer_hash: "{expected_fee_payer_hash}",
-            expected_account_updates_commitment: "{expected_account_updates_commitment}",
-            expected_full_commitment: "{expected_full_commitment}",
-        }}"""
+    yield _ZKAPP_COMMAND_HEADER_TEMPLATE.format(
+        name=escape_string(vector_name),
+        public_key=format_public_key(fee_payer["body"]["publicKey"]),
+        fee=_int_token(fee_payer["body"]["fee"]),
+        valid_until=valid_until,
+        nonce=_int_token(fee_payer["body"]["nonce"]),
+        authorization=escape_string(fee_payer["authorization"]),
+    )
+
+    if account_updates:
+        yield "vec![\n"
+        for i, update in enumerate(account_updates):
+            if i:
+                yield ","
+            yield format_account_update(update, i)
+        yield ",\n                ]"
+    else:
+        yield "vec![]"
+
+    yield _ZKAPP_COMMAND_TRAILER_TEMPLATE.format(
+        memo=memo_expr,
+        network=network,
+        expected_memo_hash=expected_memo_hash,
+        expected_fee_payer_hash=expected_fee_payer_hash,
+        expected_account_updates_commitment=expected_account_updates_commitment,
+        expected_full_commitment=expected_full_commitment,
+    )
+
+
+def generate_zkapp_command(js_data: Dict[str, Any], test_name: str = "complex_zkapp_command") -> str:
+    """Generate the complete ZKAppCommand Rust code from JavaScript object data."""
+    return "".join(iter_zkapp_command(js_data, test_name))
+
+
+def _load_js_file(js_file: str) -> Dict[str, Any]:
+    """Read and parse one JavaScript object file."""
+    with open(js_file, 'r') as f:
+        content = f.read()
+    return parse_js_object(content)
+
+
+def _generate_file(js_file: str) -> str:
+    """Convert one JavaScript object file into its Rust test vector."""
+    try:
+        # Vectors without a "name" key are named after their input file
+        return generate_zkapp_command(_load_js_file(js_file), test_name=Path(js_file).stem)
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        raise ValueError(f"{js_file}: {e}") from e
 
 
 def main():
     """Main function to process JavaScript object input and generate Rust code."""
-    if len(sys.argv) != 2:
-        print("Usage: python json_to_zkapp_mapper.py <js_file>")
+    if len(sys.argv) < 2:
+        print("Usage: python json_to_zkapp_mapper.py <js_file> [<js_file> ...]")
         sys.exit(1)
 
-    js_file = sys.argv[1]
-
-    try:
-        with open(js_file, 'r') as f:
-            content = f.read()
+    js_files = sys.argv[1:]
 
-        js_data = parse_js_object(content)
-        rust_code = generate_zkapp_command(js_data)
-        print(rust_code)
+    stems = [Path(js_file).stem for js_file in js_files]
+    duplicate_stems = sorted({stem for stem in stems if stems.count(stem) > 1})
+    if duplicate_stems:
+        print(f"Error: Input files must have distinct names, got duplicates: {', '.join(duplicate_stems)}")
+        sys.exit(1)
 
-    except FileNotFoundError:
-        print(f"Error: File '{js_file}' not found.")
+    try:
+        if len(js_files) == 1:
+            # Build the whole vector before writing, so a failure part-way
+            # through leaves stdout with only the error message
+            sys.stdout.write(_generate_file(js_files[0]))
+        else:
+            # Convert files in parallel; output keeps the argument order and is
+            # comma-separated so it can be pasted straight into a vec![...].
+            # All vectors are collected before writing, so the batch is
+            # all-or-nothing: if any file fails, stdout holds only the error.
+            with ProcessPoolExecutor() as pool:
+                rust_vectors = list(pool.map(_generate_file, js_files))
+            sys.stdout.write(",\n        ".join(rust_vectors))
+        sys.stdout.write("\n")
+
+    except FileNotFoundError as e:
+        print(f"Error: File '{e.filename}' not found.")
         sys.exit(1)
     except Exception as e:
         print(f"Error: {e}")